@@ -0,0 +1,147 @@
+"""Headless batch generation over the app.py engine, without starting the web server.
+
+Each input directory (the six CSVs, as uploaded through the UI) is generated into its own output
+directory by a separate worker process, published atomically like a /generate run.
+
+Usage:
+    python backend/cli.py temp_inputs -o output_timetables
+    python backend/cli.py inst_a/ inst_b/ inst_c/ -o outputs/ --jobs 3      # outputs/inst_a, ...
+    python backend/cli.py temp_inputs -o out --semesters 3,5 --branches CSE --time-budget 120
+
+Units of one input directory run sequentially because they share the classroom trackers;
+--jobs parallelizes across input directories. Exit status is 0 when every run succeeded,
+2 when a run stopped early on its --time-budget and 1 when any run failed.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+
+def generate_one(input_dir, output_dir, options, log_level='WARNING', cache_dir=None):
+    """Generate one input directory into output_dir; returns the engine's result dict.
+
+    Runs in a worker process: the engine keeps its directories in module globals, so every
+    input directory gets a process of its own.
+    """
+    os.environ['TIMETABLE_LOG_LEVEL'] = log_level
+    sys.path.insert(0, BACKEND_DIR)
+    import app as engine
+
+    engine.INPUT_DIR = os.path.abspath(input_dir)
+    engine.OUTPUT_DIR = os.path.abspath(output_dir)
+    if cache_dir:
+        engine._GENERATION_CACHE_DIR = cache_dir
+    os.makedirs(os.path.dirname(engine.OUTPUT_DIR) or '.', exist_ok=True)
+    os.makedirs(engine._generations_dir(), exist_ok=True)
+    started = time.perf_counter()
+    try:
+        result = engine.run_consolidated_generation(options=options)
+    except Exception as e:
+        result = {'success': False, 'message': f'Error: {e}'}
+    result['input_dir'] = engine.INPUT_DIR
+    # Runs publish into {output_dir}_generations/; report the directory holding the workbooks
+    result['output_dir'] = result.get('generation_dir') or engine.published_output_dir()
+    result['wall_seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def build_options(args):
+    """Generation options (see run_consolidated_generation) from the parsed arguments"""
+    options = {}
+    if args.semesters:
+        options['semesters'] = [int(sem) for sem in _split_list(args.semesters)]
+    if args.branches:
+        options['branches'] = _split_list(args.branches)
+    if args.seed is not None:
+        options['seed'] = args.seed
+    if args.time_budget is not None:
+        options['time_budget_seconds'] = args.time_budget
+    if args.profile or args.profile_memory:
+        options['profile'] = True
+        options['profile_memory'] = bool(args.profile_memory)
+    return options
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate timetables from the command line")
+    parser.add_argument('input_dirs', nargs='+', help="Directories holding the input CSVs")
+    parser.add_argument('-o', '--output', required=True,
+                        help="Output directory (with several inputs: parent of one directory per input)")
+    parser.add_argument('--semesters', help="Comma separated subset of 1,3,5,7")
+    parser.add_argument('--branches', help="Comma separated branches, e.g. CSE,ECE")
+    parser.add_argument('--jobs', type=int, default=1, help="Input directories generated in parallel")
+    parser.add_argument('--seed', type=int, help="Seed for the random module and string hashing")
+    parser.add_argument('--time-budget', type=float,
+                        help="Seconds per run after which no further branch/semester is started")
+    parser.add_argument('--profile', action='store_true', help="Write a cProfile report into each generation")
+    parser.add_argument('--profile-memory', action='store_true', help="Like --profile, plus tracemalloc")
+    parser.add_argument('--no-cache', action='store_true', help="Do not reuse or fill the generation cache")
+    parser.add_argument('--log-level', default='WARNING', help="Engine log level (DEBUG, INFO, WARNING, ...)")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.input_dirs if not os.path.isdir(path)]
+    if missing:
+        parser.error(f"input directory not found: {', '.join(missing)}")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    options = build_options(args)
+    if len(args.input_dirs) == 1:
+        targets = [(args.input_dirs[0], args.output)]
+    else:
+        names = [os.path.basename(os.path.normpath(path)) for path in args.input_dirs]
+        if len(set(names)) != len(names):
+            parser.error("input directories must have distinct names when generating several")
+        targets = [(path, os.path.join(args.output, name)) for path, name in zip(args.input_dirs, names)]
+
+    if args.seed is not None:
+        # Fixes set iteration order in the (spawned) workers too, so runs are reproducible
+        os.environ['PYTHONHASHSEED'] = str(args.seed)
+    cache_dir = tempfile.mkdtemp(prefix='timetable-cli-cache-') if args.no_cache else None
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(targets)), mp_context=context) as pool:
+        futures = [pool.submit(generate_one, input_dir, output_dir, options, args.log_level.upper(), cache_dir)
+                   for input_dir, output_dir in targets]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if not args.json:
+                status = 'OK' if result.get('success') else 'FAIL'
+                print(f"[{status}] {result['input_dir']} -> {result['output_dir']}: "
+                      f"{result.get('message')} ({result['wall_seconds']}s)")
+                for unit in result.get('skipped_units') or []:
+                    print(f"   [WARN] Skipped {unit['branch']} semester {unit['semester']} (time budget)")
+                if result.get('skipped_units'):
+                    print("   [WARN] Not published; the generated units are only in the directory above")
+                if result.get('profile'):
+                    print(f"   [PROFILE] {os.path.join(result['output_dir'], 'profiles', 'profile.txt')}")
+
+    if cache_dir:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+
+    if any(not result.get('success') for result in results):
+        return 1
+    if any(result.get('skipped_units') for result in results):
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Pre-forked serving mode: load the input data once, then fork workers that share it.
+
+The parent process loads and normalizes the input CSVs and builds the course index
+(app.preload_input_data), freezes the garbage collector so those objects are not touched again,
+and forks the workers. The workers share these pages copy-on-write, so a worker costs little
+extra memory and its first request does not parse any CSV. All workers accept connections on one
+listening socket.
+
+The parent checks the input data version every --check-interval seconds. When it changes
+(for example after an upload), the parent reloads the data and starts a fresh set of workers.
+It then stops the old ones, which finish their in-flight requests and generation jobs first.
+Workers that die are replaced. Generation job records are mirrored into a shared directory,
+so /jobs/<id> (status, cancel and events) answers on every worker, and an identical /generate
+request attaches to the job that any worker already runs. File locks in the generations
+directory admit jobs, run one generation at a time and publish across all workers.
+
+Usage:
+    python backend/serve.py --workers 4 --port 5000
+    python backend/serve.py --workers 8 --host 0.0.0.0 --input-dir /data/inputs --output-dir /data/outputs
+
+Needs os.fork, so Unix only. Counters behind /metrics are per worker.
+"""
+import argparse
+import gc
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+import app as timetable_app  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+logger = timetable_app.logger
+
+
+def _run_worker(flask_app, listen_socket, host, port):
+    """Worker process body: serve requests on the inherited socket until SIGTERM"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    server = make_server(host, port, flask_app, threaded=True, fd=listen_socket.fileno())
+    # Track request threads so a stopping worker finishes its in-flight requests
+    server.daemon_threads = False
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # Let a generation job running on this worker finish and publish
+        timetable_app._GENERATION_EXECUTOR.shutdown(wait=True)
+
+
+def _spawn_worker(flask_app, listen_socket, host, port):
+    # A child would otherwise inherit (and write out again) whatever is still buffered
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(flask_app, listen_socket, host, port)
+        except Exception as e:
+            logger.error(f"[FAIL] Worker {os.getpid()} crashed: {e}")
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # Never return into the parent's stack (its cleanup would run in the child)
+            os._exit(code)
+    return pid
+
+
+def _load_data():
+    version = timetable_app.preload_input_data()
+    # Objects created so far move to the permanent generation; collections in the workers then
+    # leave their pages alone and they stay shared
+    gc.collect()
+    gc.freeze()
+    return version
+
+
+def serve(host, port, workers, check_interval):
+    job_mirror_dir = tempfile.mkdtemp(prefix='timetable-jobs-')
+    timetable_app._GENERATION_JOB_MIRROR_DIR = job_mirror_dir
+    flask_app = timetable_app.create_app()
+
+    listen_socket = socket.create_server((host, port), backlog=128)
+    listen_socket.set_inheritable(True)
+    version = _load_data()
+    if version is None:
+        logger.warning("[WARN] Input data could not be loaded; workers will load it on first use")
+
+    current = {_spawn_worker(flask_app, listen_socket, host, port) for _ in range(workers)}
+    retiring = set()
+    logger.info(f"[SERVE] Serving on http://{host}:{port} with {workers} workers (pids {sorted(current)})")
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    try:
+        while not stopping:
+            time.sleep(check_interval)
+
+            # Reap exited workers and replace current ones that died
+            while True:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if pid == 0:
+                    break
+                retiring.discard(pid)
+                if pid in current:
+                    current.discard(pid)
+                    if not stopping:
+                        logger.warning(f"[WARN] Worker {pid} exited (status {status}); starting a replacement")
+                        current.add(_spawn_worker(flask_app, listen_socket, host, port))
+
+            new_version = timetable_app.get_input_data_version()
+            if new_version != version and not stopping:
+                logger.info("[SERVE] Input data changed; reloading and refreshing workers")
+                gc.unfreeze()
+                version = _load_data() or new_version
+                # Start the new workers before stopping the old ones so requests keep being served
+                replaced = current
+                current = {_spawn_worker(flask_app, listen_socket, host, port) for _ in range(workers)}
+                for pid in replaced:
+                    os.kill(pid, signal.SIGTERM)
+                retiring |= replaced
+    finally:
+        for pid in current | retiring:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in current | retiring:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        listen_socket.close()
+        shutil.rmtree(job_mirror_dir, ignore_errors=True)
+        logger.info("[SERVE] Stopped")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the timetable app with pre-forked workers")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--input-dir', help="Input CSV directory (default: backend/temp_inputs)")
+    parser.add_argument('--output-dir', help="Output directory (default: backend/output_timetables)")
+    parser.add_argument('--check-interval', type=float, default=2.0,
+                        help="Seconds between input data version checks")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not hasattr(os, 'fork'):
+        parser.error("pre-forked serving needs os.fork (Unix)")
+
+    if args.input_dir:
+        timetable_app.INPUT_DIR = os.path.abspath(args.input_dir)
+    if args.output_dir:
+        timetable_app.OUTPUT_DIR = os.path.abspath(args.output_dir)
+    serve(args.host, args.port, args.workers, args.check_interval)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
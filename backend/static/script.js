@@ -1,5 +1,7 @@
 // Global variables
 let currentTimetables = [];
+const TIMETABLES_PAGE_SIZE = 6;
+const GENERATION_POLL_INTERVAL_MS = 1000;
 let currentView = 'grid';
 let currentSemesterFilter = 'all';
 let currentSectionFilter = 'all';
@@ -766,7 +768,12 @@ async function generateTimetables() {
             }
         });
         
-        const result = await response.json();
+        let result = await response.json();
+        
+        // Generation runs as a background job: poll it until it finishes
+        if (result.success && result.job_id) {
+            result = await waitForGenerationJob(result.job_id);
+        }
         console.log("📦 Generation result:", result);
         
         if (result.success) {
@@ -788,41 +795,119 @@ async function generateTimetables() {
     }
 }
 
-async function loadTimetables() {
-    try {
-        console.log("🔄 Loading timetables...");
-        const response = await fetch('/timetables');
+function waitForGenerationJob(jobId) {
+    // Prefer the server-sent event stream; fall back to polling where EventSource is unavailable
+    if (!window.EventSource) {
+        return pollGenerationJob(jobId);
+    }
+    
+    const subtitleEl = document.getElementById('loading-subtitle');
+    return new Promise((resolve) => {
+        const source = new EventSource(`/jobs/${jobId}/events`);
+        let completedUnits = 0;
+        let totalUnits = 0;
+        const setSubtitle = (text) => {
+            if (subtitleEl) subtitleEl.textContent = text;
+        };
         
+        source.addEventListener('data_loaded', (e) => {
+            totalUnits = JSON.parse(e.data).total_units;
+            setSubtitle(`Data loaded - scheduling ${totalUnits} timetables...`);
+        });
+        source.addEventListener('scheduling', (e) => {
+            const data = JSON.parse(e.data);
+            setSubtitle(`Scheduled ${completedUnits}/${totalUnits} - ${data.branch} Semester ${data.semester}`);
+        });
+        source.addEventListener('unit_finished', (e) => {
+            const data = JSON.parse(e.data);
+            completedUnits += 1;
+            console.log(`🗓️ ${data.branch} Semester ${data.semester} done in ${data.elapsed_seconds}s`);
+        });
+        source.addEventListener('auditing', () => setSubtitle('Writing audit files...'));
+        source.addEventListener('finished', (e) => {
+            source.close();
+            const data = JSON.parse(e.data);
+            resolve(data.result || { success: false, message: data.error || `Generation ${data.status}` });
+        });
+        source.onerror = () => {
+            // Stream dropped (e.g. proxy timeout): finish by polling the job instead
+            source.close();
+            resolve(pollGenerationJob(jobId));
+        };
+    });
+}
+
+async function pollGenerationJob(jobId) {
+    const subtitleEl = document.getElementById('loading-subtitle');
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, GENERATION_POLL_INTERVAL_MS));
+        const response = await fetch(`/jobs/${jobId}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
+        const job = await response.json();
         
-        const data = await response.json();
-        
-        // Validate and normalize the response data
-        if (Array.isArray(data)) {
-            // Direct array response
-            currentTimetables = data;
-        } else if (data && Array.isArray(data.timetables)) {
-            // Response with timetables property
-            currentTimetables = data.timetables;
-        } else if (data && data.data && Array.isArray(data.data)) {
-            // Response with data property containing array
-            currentTimetables = data.data;
-        } else {
-            // Unexpected response structure
-            console.warn('⚠️ Unexpected timetables response structure:', data);
-            currentTimetables = [];
+        if (subtitleEl && job.progress && job.progress.total_units) {
+            const unit = job.current_unit ? ` - ${job.current_unit.branch} Semester ${job.current_unit.semester}` : '';
+            subtitleEl.textContent = `Scheduled ${job.progress.completed_units}/${job.progress.total_units}${unit}`;
         }
         
-        console.log(`📊 Loaded ${currentTimetables.length} timetables`);
-        
-        // Update course database with server data
-        if (currentTimetables.length > 0 && currentTimetables[0].course_info) {
-            courseDatabase = currentTimetables[0].course_info;
+        if (job.status === 'succeeded') {
+            return job.result;
+        }
+        if (job.status === 'failed' || job.status === 'cancelled') {
+            return job.result || { success: false, message: job.error || `Generation ${job.status}` };
         }
+    }
+}
+
+async function loadTimetables() {
+    try {
+        console.log("🔄 Loading timetables...");
+        // Fetch page by page so the first timetables render before every workbook has been read
+        const loaded = [];
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ limit: TIMETABLES_PAGE_SIZE });
+            if (cursor) params.set('cursor', cursor);
+            const response = await fetch(`/timetables?${params.toString()}`);
+            
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            const data = await response.json();
+            
+            // Validate and normalize the response data
+            if (Array.isArray(data)) {
+                // Direct array response
+                loaded.push(...data);
+                cursor = null;
+            } else if (data && Array.isArray(data.timetables)) {
+                // Paginated response with timetables property
+                loaded.push(...data.timetables);
+                cursor = data.next_cursor || null;
+            } else if (data && data.data && Array.isArray(data.data)) {
+                // Response with data property containing array
+                loaded.push(...data.data);
+                cursor = null;
+            } else {
+                // Unexpected response structure
+                console.warn('⚠️ Unexpected timetables response structure:', data);
+                cursor = null;
+            }
+            
+            currentTimetables = loaded.slice();
+            
+            // Update course database with server data
+            if (currentTimetables.length > 0 && currentTimetables[0].course_info) {
+                courseDatabase = currentTimetables[0].course_info;
+            }
+            
+            renderTimetables();
+        } while (cursor);
         
-        renderTimetables();
+        console.log(`📊 Loaded ${currentTimetables.length} timetables`);
         
     } catch (error) {
         console.error('❌ Error loading timetables:', error);
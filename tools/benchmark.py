@@ -0,0 +1,215 @@
+"""End-to-end benchmark of the timetable pipeline on synthetic datasets.
+
+For each dataset size a fresh Python process generates a synthetic institute (see
+tools/synthetic_dataset.py), runs a full generation (load -> schedule -> allocate -> export ->
+audit) through the Flask test client and then times the hot read endpoints. It records wall time,
+peak RSS and the per-phase timings of the run. Everything runs locally; no network is needed.
+
+Usage:
+    python tools/benchmark.py                                # small + medium + large, print results
+    python tools/benchmark.py --sizes small --save-baseline  # write tools/benchmark_baseline.json
+    python tools/benchmark.py --threshold 0.25               # exit 1 on >25% regression vs the baseline
+
+Peak RSS comes from resource.getrusage, so this needs a Unix-like OS (any plain Linux box).
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(TOOLS_DIR), 'backend')
+DEFAULT_BASELINE = os.path.join(TOOLS_DIR, 'benchmark_baseline.json')
+
+# Dataset sizes as multiples of the real institute (3 branches, 36 rooms, 800 students)
+DATASET_SCALES = {'small': 1, 'medium': 3, 'large': 10}
+READ_ENDPOINTS = ['/timetables', '/stats', '/download-all']
+READ_REPEATS = 5
+# Timings also have to grow by at least this many seconds to count, so sub-second phases
+# jittering by a few hundred milliseconds do not fail the gate
+DEFAULT_MIN_DELTA_SECONDS = 0.5
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def run_single_benchmark(size, seed, work_dir):
+    """Benchmark one dataset size inside this process; returns its result dict"""
+    sys.path.insert(0, TOOLS_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+    import synthetic_dataset
+
+    input_dir = os.path.join(work_dir, 'inputs')
+    output_dir = os.path.join(work_dir, 'outputs')
+    synthetic_dataset.write_dataset(input_dir, seed=seed, **synthetic_dataset.scaled_parameters(DATASET_SCALES[size]))
+
+    import_started = time.perf_counter()
+    import app as timetable_app
+    import_seconds = time.perf_counter() - import_started
+    timetable_app.INPUT_DIR = input_dir
+    timetable_app.OUTPUT_DIR = output_dir
+    timetable_app._GENERATION_CACHE_DIR = os.path.join(work_dir, 'generation_cache')
+    os.makedirs(output_dir, exist_ok=True)
+    # The engine breaks ties with the random module; pin it so runs are comparable
+    random.seed(seed)
+
+    client = timetable_app.app.test_client()
+    started = time.perf_counter()
+    response = client.post('/generate-with-baskets')
+    generate_seconds = time.perf_counter() - started
+    result = response.get_json() or {}
+    if not result.get('success'):
+        raise RuntimeError(f"Generation failed for {size} dataset: {result.get('message')}")
+
+    endpoints = {}
+    for endpoint in READ_ENDPOINTS:
+        timings = []
+        for _ in range(READ_REPEATS):
+            started = time.perf_counter()
+            response = client.get(endpoint)
+            response.get_data()
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {endpoint} returned {response.status_code}")
+        # The first request is cold (parses workbooks), the rest hit the response caches
+        endpoints[endpoint] = {'cold_seconds': round(timings[0], 4),
+                               'warm_seconds': round(sorted(timings[1:])[len(timings[1:]) // 2], 4)}
+
+    return {
+        'size': size,
+        'scale': DATASET_SCALES[size],
+        'seed': seed,
+        'import_seconds': round(import_seconds, 3),
+        'generate_seconds': round(generate_seconds, 3),
+        'generated_count': result.get('generated_count'),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+        'phase_timings': {phase: timing['total_seconds'] for phase, timing in result.get('phase_timings', {}).items()},
+        'endpoints': endpoints,
+    }
+
+
+def run_benchmark(size, seed):
+    """Run one dataset size in a fresh interpreter so peak RSS and caches are per size"""
+    work_dir = tempfile.mkdtemp(prefix=f'timetable-bench-{size}-')
+    result_path = os.path.join(work_dir, 'result.json')
+    env = dict(os.environ, TIMETABLE_LOG_LEVEL='WARNING')
+    try:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-one', size, '--seed', str(seed),
+             '--work-dir', work_dir, '--result-file', result_path],
+            check=True, env=env, stdout=subprocess.DEVNULL
+        )
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _gated_metrics(result):
+    """{metric name: value} compared against the baseline (higher is worse for all of them)"""
+    metrics = {
+        'generate_seconds': result['generate_seconds'],
+        'peak_rss_mb': result['peak_rss_mb'],
+    }
+    for phase, seconds in result['phase_timings'].items():
+        metrics[f'phase.{phase}'] = seconds
+    for endpoint, timing in result['endpoints'].items():
+        metrics[f'endpoint.{endpoint}.cold_seconds'] = timing['cold_seconds']
+        metrics[f'endpoint.{endpoint}.warm_seconds'] = timing['warm_seconds']
+    return metrics
+
+
+def find_regressions(results, baseline, threshold, min_delta=DEFAULT_MIN_DELTA_SECONDS):
+    """[(size, metric, baseline value, current value)] for metrics more than threshold worse"""
+    regressions = []
+    for size, result in results.items():
+        if size not in baseline:
+            continue
+        previous = _gated_metrics(baseline[size])
+        for metric, value in _gated_metrics(result).items():
+            old = previous.get(metric)
+            if old is None:
+                continue
+            if metric != 'peak_rss_mb' and value - old < min_delta:
+                continue
+            if value > old * (1 + threshold):
+                regressions.append((size, metric, old, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark timetable generation and read endpoints")
+    parser.add_argument('--sizes', default='small,medium,large',
+                        help=f"Comma separated dataset sizes ({', '.join(DATASET_SCALES)})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="Write this run's results as the baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown/growth vs the baseline before failing (0.25 = 25%%)")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA_SECONDS,
+                        help="Ignore timing regressions smaller than this many seconds")
+    parser.add_argument('--output', help="Also write this run's results to this JSON file")
+    parser.add_argument('--run-one', choices=sorted(DATASET_SCALES), help=argparse.SUPPRESS)
+    parser.add_argument('--work-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        result = run_single_benchmark(args.run_one, args.seed, args.work_dir)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in DATASET_SCALES]
+    if unknown:
+        parser.error(f"unknown dataset size(s): {', '.join(unknown)}")
+
+    results = {}
+    for size in sizes:
+        print(f"[BENCH] Running {size} dataset (x{DATASET_SCALES[size]})...")
+        results[size] = run_benchmark(size, args.seed)
+        result = results[size]
+        print(f"   generate: {result['generate_seconds']}s for {result['generated_count']} timetables, "
+              f"peak RSS {result['peak_rss_mb']} MB")
+        for phase, seconds in sorted(result['phase_timings'].items(), key=lambda item: -item[1]):
+            print(f"   phase {phase}: {seconds}s")
+        for endpoint, timing in result['endpoints'].items():
+            print(f"   GET {endpoint}: cold {timing['cold_seconds']}s, warm {timing['warm_seconds']}s")
+
+    report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0], 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"[WARN] No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = find_regressions(results, baseline, args.threshold, args.min_delta)
+    for size, metric, old, value in regressions:
+        growth = f" (+{(value / old - 1) * 100:.0f}%)" if old else ""
+        print(f"[FAIL] {size} {metric}: {old} -> {value}{growth}")
+    if regressions:
+        return 1
+    print(f"[OK] No regressions beyond {args.threshold * 100:.0f}% against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
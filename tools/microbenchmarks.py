@@ -0,0 +1,249 @@
+"""Micro-benchmarks for the scheduling and allocation primitives in backend/app.py.
+
+Each primitive is timed at several input sizes built from synthetic data (see
+tools/synthetic_dataset.py), so a regression can be pinned on one function rather than read off
+the end-to-end numbers of tools/benchmark.py.
+
+Usage:
+    python tools/microbenchmarks.py                          # print a table
+    python tools/microbenchmarks.py --output micro.json      # also write the JSON report
+    python tools/microbenchmarks.py --compare micro.json     # show the change vs an earlier report
+    python tools/microbenchmarks.py --only parse_ltpsc,get_course_info
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(TOOLS_DIR), 'backend')
+sys.path.insert(0, TOOLS_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+# Keep engine DEBUG output off while timing
+os.environ.setdefault('TIMETABLE_LOG_LEVEL', 'WARNING')
+
+import synthetic_dataset  # noqa: E402
+import app as engine  # noqa: E402
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
+# Input sizes per benchmark: multiples of the real institute for table-driven primitives,
+# item counts for the parsers
+SCALES = [1, 10, 100]
+ITEM_COUNTS = [100, 1000, 10000]
+WORKSHEET_ROWS = [10, 100, 1000]
+# Aim for roughly this much timed work per (benchmark, size)
+TARGET_SECONDS = 0.5
+
+CELL_SAMPLES = ['CS301 [C101]', 'MA161 (Tutorial) [C004]', 'CS304 (Lab) [L106, L107]', 'ELECTIVE_B3 [C202]',
+                'ELECTIVE_B5', 'Free', 'LUNCH BREAK', 'EC 262', 'DS-161 (Lab)', 'HSS_B3 [L402]', None, 'MINOR: VLSI']
+CELL_TEMPLATES = ['CS{n} [C101]', 'MA{n} (Tutorial) [C004]', 'CS{n} (Lab) [L106, L107]', 'ELECTIVE_B3 [C{n}]',
+                  'ELECTIVE_B5 {n}', 'EC {n}', 'DS-{n} (Lab)', 'HSS_B3 [L{n}]', 'MINOR: VLSI {n}']
+SLOT_SAMPLES = ['09:00-10:30', '10:30-12:00', '3', 5, 7.0, 'LUNCH', '17:00-18:00', ' 13:00-14:30 ', 'x']
+LTPSC_SAMPLES = ['3-1-0-0-4', '2-0-0-0-2', '3-0-2-0-4', '1-0-0-0-1', '0-0-0-8-2', 'bad', '3-1-2-0-5']
+
+
+def _time_calls(call, items, setup=None):
+    """Call call(item) for every item, repeating until TARGET_SECONDS; returns stats in microseconds
+
+    setup() runs untimed before each pass, e.g. to reset trackers the calls fill up.
+    """
+    calls = 0
+    timed = 0.0
+    best_pass = None
+    while True:
+        if setup:
+            setup()
+        pass_started = time.perf_counter()
+        for item in items:
+            call(item)
+        pass_seconds = time.perf_counter() - pass_started
+        best_pass = pass_seconds if best_pass is None else min(best_pass, pass_seconds)
+        timed += pass_seconds
+        calls += len(items)
+        if timed >= TARGET_SECONDS:
+            break
+    return {
+        'calls': calls,
+        'mean_us': round(timed / calls * 1e6, 3),
+        'best_pass_mean_us': round(best_pass / len(items) * 1e6, 3),
+    }
+
+
+def _dataset(scale, seed=0):
+    return synthetic_dataset.generate_dataset(seed=seed, **synthetic_dataset.scaled_parameters(scale))
+
+
+def bench_find_suitable_classroom_with_tracking(scale):
+    classrooms = _dataset(scale)['classroom_data.csv']
+    rng = random.Random(scale)
+    slots = [(day, slot) for day in DAYS for slot in engine.TIME_SLOT_LABELS]
+    requests = [(rng.choice([40, 60, 96, 120, 200]), *rng.choice(slots)) for _ in range(200)]
+
+    def call(item):
+        enrollment, day, slot = item
+        engine.find_suitable_classroom_with_tracking(classrooms, enrollment, day, slot, tracker[0])
+
+    tracker = [{}]
+    with engine.generation_context_scope():
+        stats = _time_calls(call, requests, setup=lambda: tracker.__setitem__(0, {}))
+    return dict(stats, rooms=len(classrooms))
+
+
+def bench_find_suitable_classroom_for_lab_pair(scale):
+    classrooms = _dataset(scale)['classroom_data.csv']
+    labs = classrooms[classrooms['Type'].str.contains('lab', case=False)]
+    rng = random.Random(scale)
+    pairs = list(zip(engine.TIME_SLOT_LABELS, engine.TIME_SLOT_LABELS[1:]))
+    requests = [(rng.choice([30, 40, 60]), rng.choice(DAYS), *rng.choice(pairs)) for _ in range(200)]
+
+    def call(item):
+        enrollment, day, slot1, slot2 = item
+        engine.find_suitable_classroom_for_lab_pair(labs, enrollment, day, slot1, slot2, tracker[0])
+
+    tracker = [{}]
+    with engine.generation_context_scope():
+        stats = _time_calls(call, requests, setup=lambda: tracker.__setitem__(0, {}))
+    return dict(stats, lab_rooms=len(labs))
+
+
+def bench_check_all_faculty_available(scale):
+    faculty = _dataset(scale)['faculty_availability.csv']['FACULTY NAME'].tolist()
+    rng = random.Random(scale)
+    slots = [(day, slot) for day in DAYS for slot in engine.TIME_SLOT_LABELS]
+    with engine.generation_context_scope():
+        # Book about half of the faculty into random slots, like a half-built timetable
+        for name in faculty[::2]:
+            day, slot = rng.choice(slots)
+            engine.book_faculty_for_slot(name, day, slot, 'CS101')
+        requests = [(rng.sample(faculty, k=min(len(faculty), rng.choice([1, 2, 3]))), *rng.choice(slots))
+                    for _ in range(500)]
+        stats = _time_calls(lambda item: engine.check_all_faculty_available(item[0], item[1], item[2]), requests)
+    return dict(stats, faculty=len(faculty))
+
+
+def bench_parse_timetable_cell(count):
+    rng = random.Random(count)
+    # Distinct cells (the sample with a varied code or room) and a cleared cell cache before each
+    # pass, so every call runs the parser instead of returning a memoized result
+    cells = [rng.choice(CELL_TEMPLATES).format(n=100 + index) for index in range(count)]
+    stats = _time_calls(engine.parse_timetable_cell, cells, setup=engine._TIMETABLE_CELL_CACHE.clear)
+    return dict(stats, cells=count)
+
+
+def bench_parse_timetable_grid(rows):
+    rng = random.Random(rows)
+    slots = [engine.TIME_SLOT_LABELS[index % len(engine.TIME_SLOT_LABELS)] for index in range(rows)]
+    grid = engine.pd.DataFrame([[rng.choice(CELL_SAMPLES) for _ in DAYS] for _ in range(rows)],
+                               index=slots, columns=DAYS)
+    return dict(_time_calls(engine.parse_timetable_grid, [grid]), rows=rows)
+
+
+def bench_normalize_time_slot_label(count):
+    rng = random.Random(count)
+    labels = [rng.choice(SLOT_SAMPLES) for _ in range(count)]
+    return dict(_time_calls(engine.normalize_time_slot_label, labels), labels=count)
+
+
+def bench_parse_ltpsc(count):
+    rng = random.Random(count)
+    values = [rng.choice(LTPSC_SAMPLES) for _ in range(count)]
+    return dict(_time_calls(engine.parse_ltpsc, values), values=count)
+
+
+def bench_get_course_info(scale):
+    with tempfile.TemporaryDirectory(prefix='timetable-micro-') as input_dir:
+        synthetic_dataset.write_dataset(input_dir, **synthetic_dataset.scaled_parameters(scale))
+        previous_input_dir = engine.INPUT_DIR
+        engine.INPUT_DIR = input_dir
+        try:
+            dfs = engine.load_all_data(force_reload=True)
+        finally:
+            engine.INPUT_DIR = previous_input_dir
+    # get_course_info memoizes per loaded course data; time the build itself
+    return dict(_time_calls(engine._build_course_info, [dfs]), course_rows=len(dfs['course']))
+
+
+def bench_format_excel_worksheet(rows):
+    from openpyxl import Workbook
+    rng = random.Random(rows)
+    courses = [f"CS{100 + index}" for index in range(40)]
+    colors = engine.generate_course_colors(courses, {})
+
+    # Timed per call: building the N-row sheet plus formatting it, as the exporter does
+    def build_and_format(_):
+        worksheet = Workbook().active
+        worksheet.append(['Time Slot'] + DAYS)
+        for index in range(rows):
+            slot = engine.TIME_SLOT_LABELS[index % len(engine.TIME_SLOT_LABELS)]
+            worksheet.append([slot] + [rng.choice(courses + ['Free', 'ELECTIVE_B3']) for _ in DAYS])
+        engine.format_excel_worksheet(worksheet, colors)
+
+    return dict(_time_calls(build_and_format, [None]), rows=rows)
+
+
+BENCHMARKS = {
+    'find_suitable_classroom_with_tracking': (bench_find_suitable_classroom_with_tracking, SCALES),
+    'find_suitable_classroom_for_lab_pair': (bench_find_suitable_classroom_for_lab_pair, SCALES),
+    'check_all_faculty_available': (bench_check_all_faculty_available, SCALES),
+    'parse_timetable_cell': (bench_parse_timetable_cell, ITEM_COUNTS),
+    'parse_timetable_grid': (bench_parse_timetable_grid, WORKSHEET_ROWS),
+    'normalize_time_slot_label': (bench_normalize_time_slot_label, ITEM_COUNTS),
+    'parse_ltpsc': (bench_parse_ltpsc, ITEM_COUNTS),
+    'get_course_info': (bench_get_course_info, SCALES),
+    'format_excel_worksheet': (bench_format_excel_worksheet, WORKSHEET_ROWS),
+}
+
+
+def run_microbenchmarks(names=None):
+    """{benchmark: {size: stats}} for the selected benchmarks (all by default)"""
+    report = {}
+    for name, (bench, sizes) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        report[name] = {}
+        for size in sizes:
+            random.seed(0)
+            report[name][str(size)] = bench(size)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time scheduling/allocation primitives at several input sizes")
+    parser.add_argument('--only', help=f"Comma separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--compare', help="Earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.only.split(',')] if args.only else None
+    unknown = [name for name in names or [] if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    results = run_microbenchmarks(names)
+    previous = {}
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)['results']
+
+    for name, by_size in results.items():
+        for size, stats in by_size.items():
+            line = f"{name:40s} size={size:>6s}  {stats['best_pass_mean_us']:>12.2f} us/call"
+            old = previous.get(name, {}).get(size)
+            if old:
+                line += f"  ({(stats['best_pass_mean_us'] / old['best_pass_mean_us'] - 1) * 100:+.0f}%)"
+            print(line)
+
+    if args.output:
+        report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0],
+                  'results': results}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Wrote report to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+"""Synthetic institution dataset generator for scale testing.
+
+Writes the six input CSVs that backend/app.py load_all_data() reads (course_data,
+faculty_availability, classroom_data, student_data, exams_data, minor_data) with the same
+columns as backend/temp_inputs. Output is fully determined by the parameters and the seed.
+
+Usage:
+    python tools/synthetic_dataset.py OUTPUT_DIR [--scale 10] [--branches 3] [--seed 0] ...
+
+The engine only schedules semesters 1, 3, 5 and 7 and only splits CSE into sections, so
+datasets keep the odd-semester numbering and the CSE/DSAI/ECE names for the first branches;
+`sections` sizes the rooms a section needs rather than adding sections to the timetables.
+"""
+import argparse
+import math
+import os
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+# Parameters of the institute in backend/temp_inputs (about 180 course rows, 36 rooms, 800 students)
+DEFAULT_PARAMETERS = {
+    'branches': 3,
+    'semesters': 4,
+    'sections': 2,
+    'courses_per_semester': 10,
+    'electives_per_basket': 4,
+    'faculty': 40,
+    'rooms': 36,
+    'students': 800,
+}
+
+# Parameters --scale grows; the others keep their default whatever the scale
+SCALED_PARAMETERS = ('branches', 'faculty', 'rooms', 'students')
+
+BRANCH_NAMES = ['CSE', 'DSAI', 'ECE', 'ME', 'CE', 'EE', 'BT', 'CH', 'MT', 'PH', 'AE', 'MN']
+# Course code and roll number prefixes; other branches use their full name, so prefixes never repeat
+BRANCH_CODE_PREFIXES = {'CSE': 'CS', 'DSAI': 'DS', 'ECE': 'EC'}
+
+# Elective baskets the engine allows per semester (see separate_courses_by_type)
+SEMESTER_BASKETS = {
+    1: ['ELECTIVE_B1'],
+    3: ['ELECTIVE_B3'],
+    5: ['ELECTIVE_B4', 'ELECTIVE_B5'],
+    7: ['ELECTIVE_B6', 'ELECTIVE_B7', 'ELECTIVE_B8', 'ELECTIVE_B9'],
+}
+
+# (LTPSC, credits, weight) for full-semester core courses, roughly the mix of the real data
+CORE_LTPSC = [('3-1-0-0-4', 4, 8), ('3-0-2-0-4', 4, 2), ('3-0-0-0-3', 3, 1), ('3-1-2-0-5', 5, 1)]
+HALF_SEMESTER_LTPSC = [('2-0-0-0-2', 2, 4), ('1-0-0-0-1', 1, 1)]
+ELECTIVE_LTPSC = [('3-0-0-0-3', 3, 2), ('3-1-0-0-4', 4, 2), ('2-0-2-0-3', 3, 1)]
+
+MINOR_NAMES = ['Generative Ai', 'Cybersecurity', 'Design', 'VLSI', 'Quantum Information',
+               'UG Research Experience', 'Innovation and Experience']
+
+FIRST_NAMES = ['Aarav', 'Aditya', 'Akshay', 'Ananya', 'Arjun', 'Deepa', 'Divya', 'Gaurav', 'Ishita',
+               'Karan', 'Kavya', 'Meera', 'Nikhil', 'Pooja', 'Rahul', 'Riya', 'Rohan', 'Sanjana',
+               'Shreya', 'Siddharth', 'Sneha', 'Tanvi', 'Varun', 'Vikram']
+LAST_NAMES = ['Sharma', 'Patel', 'Yadav', 'Reddy', 'Iyer', 'Nair', 'Kumar', 'Gupta', 'Rao', 'Singh',
+              'Menon', 'Joshi', 'Das', 'Hegde', 'Kulkarni', 'Pillai', 'Bhat', 'Verma']
+SUBJECTS = ['Algorithms', 'Signals', 'Networks', 'Optimization', 'Machine Learning', 'Databases',
+            'Circuits', 'Statistics', 'Linear Algebra', 'Compilers', 'Robotics', 'Control Systems',
+            'Embedded Systems', 'Cryptography', 'Data Mining', 'Operating Systems', 'Graphics',
+            'Communication Systems', 'Information Theory', 'Economics']
+
+
+def scaled_parameters(scale=1, **overrides):
+    """DEFAULT_PARAMETERS grown `scale` times (more branches, faculty, rooms and students).
+
+    Courses per semester stay fixed, so a 10x dataset has about 10x the course rows.
+    """
+    parameters = dict(DEFAULT_PARAMETERS)
+    for key in SCALED_PARAMETERS:
+        parameters[key] = max(1, int(round(parameters[key] * scale)))
+    parameters.update(overrides)
+    return parameters
+
+
+def _weighted_choice(rng, options):
+    return rng.choices(options, weights=[weight for *_, weight in options])[0]
+
+
+def _branch_names(count):
+    names = BRANCH_NAMES[:count]
+    names += [f"B{index:02d}" for index in range(len(names) + 1, count + 1)]
+    return names
+
+
+def _branch_code_prefix(branch):
+    return BRANCH_CODE_PREFIXES.get(branch, branch)
+
+
+def _person_names(rng, count):
+    names = set()
+    while len(names) < count:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        # Disambiguate repeats the way real rosters do, with an initial
+        if name in names:
+            name = f"{name} {chr(ord('A') + len(names) % 26)}{len(names)}"
+        names.add(name)
+    return sorted(names)
+
+
+def generate_dataset(branches=3, semesters=4, sections=2, courses_per_semester=10, electives_per_basket=4,
+                     faculty=40, rooms=36, students=800, seed=0):
+    """Build the six input tables; returns {csv filename: DataFrame}"""
+    rng = random.Random(seed)
+    branch_names = _branch_names(branches)
+    semester_ids = [2 * index + 1 for index in range(semesters)]
+    cohort = max(1, students // (branches * semesters))
+    section_size = math.ceil(cohort / max(1, sections))
+    code_width = max(2, len(str(courses_per_semester)))
+
+    faculty_names = _person_names(rng, faculty)
+
+    def pick_faculty():
+        # Most courses have one instructor, some are co-taught (comma separated, as in the real data)
+        instructors = rng.sample(faculty_names, k=min(len(faculty_names), 1 if rng.random() < 0.85 else 2))
+        return ', '.join(instructors)
+
+    course_rows = []
+    exam_rows = []
+    exam_date = date(2024, 12, 15)
+    for sem in semester_ids:
+        # The first few core courses of a semester are common to every branch (same code and faculty)
+        common_count = max(1, courses_per_semester // 5)
+        common_courses = []
+        for index in range(common_count):
+            half_semester = index % 2 == 1
+            ltpsc, credits, _ = _weighted_choice(rng, HALF_SEMESTER_LTPSC if half_semester else CORE_LTPSC)
+            common_courses.append({
+                'Course Code': f"MA{sem}{index + 1:0{code_width}d}",
+                'Course Name': f"{rng.choice(SUBJECTS)} {sem}{index + 1}",
+                'LTPSC': ltpsc,
+                'Credits': credits,
+                'Faculty': pick_faculty(),
+                'Half Semester (Yes/No)': 'Yes' if half_semester else 'No',
+                'Post mid-sem': 'Yes' if index % 4 == 3 else 'No',
+            })
+
+        for branch in branch_names:
+            prefix = _branch_code_prefix(branch)
+            for course in common_courses:
+                course_rows.append(dict(course, **{
+                    'Semester': sem, 'Department': branch, 'Registered Students': cohort * branches,
+                    'Elective (Yes/No)': 'No', 'Basket': 'None', 'Common': 'Yes',
+                }))
+            for index in range(common_count, courses_per_semester):
+                half_semester = rng.random() < 0.3
+                ltpsc, credits, _ = _weighted_choice(rng, HALF_SEMESTER_LTPSC if half_semester else CORE_LTPSC)
+                code = f"{prefix}{sem}{index + 1:0{code_width}d}"
+                course_rows.append({
+                    'Course Code': code,
+                    'Course Name': f"{rng.choice(SUBJECTS)} {'I' * (index % 3 + 1)}",
+                    'Semester': sem, 'Department': branch, 'LTPSC': ltpsc, 'Credits': credits,
+                    'Faculty': pick_faculty(), 'Registered Students': cohort,
+                    'Elective (Yes/No)': 'No', 'Half Semester (Yes/No)': 'Yes' if half_semester else 'No',
+                    'Basket': 'None', 'Post mid-sem': 'Yes' if half_semester and rng.random() < 0.5 else 'No',
+                    'Common': 'No',
+                })
+                exam_rows.append({
+                    'Course Code': code, 'Course Name': course_rows[-1]['Course Name'], 'Exam Type': 'Theory',
+                    'Exam Duration (minutes)': 180, 'Department': branch, 'Semester': sem,
+                    'Preferred Exam Date': exam_date.isoformat(),
+                    'Alternate Exam Date': (exam_date + timedelta(days=7)).isoformat(), 'Constraints': 'None',
+                })
+                exam_date += timedelta(days=1)
+
+        # Electives are cross-listed: one row per branch with the same code, basket and faculty
+        for basket_index, basket in enumerate(SEMESTER_BASKETS.get(sem, [f"ELECTIVE_S{sem}"])):
+            for index in range(electives_per_basket):
+                ltpsc, credits, _ = _weighted_choice(rng, ELECTIVE_LTPSC)
+                elective = {
+                    'Course Code': f"EL{sem}{basket_index}{index + 1:0{code_width}d}",
+                    'Course Name': f"Topics in {rng.choice(SUBJECTS)}",
+                    'Semester': sem, 'LTPSC': ltpsc, 'Credits': credits, 'Faculty': pick_faculty(),
+                    'Registered Students': max(1, cohort * branches // max(1, electives_per_basket)),
+                    'Elective (Yes/No)': 'Yes', 'Half Semester (Yes/No)': 'No', 'Basket': basket,
+                    'Post mid-sem': 'No', 'Common': 'No',
+                }
+                for branch in branch_names:
+                    course_rows.append(dict(elective, Department=branch))
+
+    course_columns = ['Course Code', 'Course Name', 'Semester', 'Department', 'LTPSC', 'Credits', 'Faculty',
+                      'Registered Students', 'Elective (Yes/No)', 'Half Semester (Yes/No)', 'Basket',
+                      'Post mid-sem', 'Common']
+    exam_columns = ['Course Code', 'Course Name', 'Exam Type', 'Exam Duration (minutes)', 'Department',
+                    'Semester', 'Preferred Exam Date', 'Alternate Exam Date', 'Constraints']
+
+    # Rooms: C-prefix lecture rooms sized for a section, a few large rooms for common courses,
+    # L-prefix overflow classrooms (80 seats) and 40-seat labs, mirroring the real building
+    room_rows = []
+    lab_count = max(2, rooms // 6)
+    overflow_count = max(1, rooms // 5)
+    large_count = max(1, rooms // 10)
+    classroom_count = max(1, rooms - lab_count - overflow_count - large_count)
+    lecture_capacity = max(96, int(math.ceil(section_size / 12.0)) * 12)
+    large_capacity = max(120, int(math.ceil(min(cohort * branches, 240) / 12.0)) * 12)
+    for index in range(classroom_count):
+        room_rows.append({'Room Number': f"C{101 + index}", 'Type': 'classroom', 'Capacity': lecture_capacity,
+                          'Facilities': rng.choice(['Projector', 'TV']), 'exam capacity': 48})
+    for index in range(large_count):
+        room_rows.append({'Room Number': f"C{index + 1:03d}", 'Type': 'large classroom' if index else 'Auditorium',
+                          'Capacity': large_capacity if index else max(240, large_capacity),
+                          'Facilities': 'Projector' if index else 'Audio/Video System', 'exam capacity': 0})
+    for index in range(overflow_count):
+        room_rows.append({'Room Number': f"L{401 + index}", 'Type': 'classroom', 'Capacity': 80,
+                          'Facilities': 'TV', 'exam capacity': 48})
+    for index in range(lab_count):
+        hardware = index % 3 == 0
+        room_rows.append({'Room Number': f"L{105 + index}", 'Type': 'Hardware Lab' if hardware else 'Software Lab',
+                          'Capacity': 40, 'Facilities': 'Equipment' if hardware else 'Computers', 'exam capacity': 0})
+
+    student_rows = []
+    number_width = max(3, len(str(cohort)))
+    for sem in semester_ids:
+        year = 25 - (sem - 1) // 2
+        for branch in branch_names:
+            prefix = _branch_code_prefix(branch)
+            for number in range(1, cohort + 1):
+                student_rows.append({
+                    'Roll No': f"{year:02d}B{prefix}{number:0{number_width}d}",
+                    'Name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    'Semester': sem, 'Department': branch,
+                })
+
+    # Only common courses and cross-listed electives share a code between departments
+    core_codes = [row['Course Code'] for row in course_rows
+                  if row['Common'] == 'No' and row['Elective (Yes/No)'] == 'No']
+    assert len(core_codes) == len(set(core_codes)), "duplicate core course codes"
+    roll_numbers = [row['Roll No'] for row in student_rows]
+    assert len(roll_numbers) == len(set(roll_numbers)), "duplicate roll numbers"
+
+    minor_rows = []
+    for sem in semester_ids[1:-1] or semester_ids:
+        for name in MINOR_NAMES:
+            minor_rows.append({'MINOR COURSE ': name, 'SEMESTER': sem,
+                               'REGISTERED STUDENTS': rng.randint(0, max(1, cohort * branches // 5))})
+
+    return {
+        'course_data.csv': pd.DataFrame(course_rows, columns=course_columns),
+        'faculty_availability.csv': pd.DataFrame({'FACULTY NAME': faculty_names}),
+        'classroom_data.csv': pd.DataFrame(room_rows, columns=['Room Number', 'Type', 'Capacity', 'Facilities', 'exam capacity']),
+        'student_data.csv': pd.DataFrame(student_rows, columns=['Roll No', 'Name', 'Semester', 'Department']),
+        'exams_data.csv': pd.DataFrame(exam_rows, columns=exam_columns),
+        'minor_data.csv': pd.DataFrame(minor_rows, columns=['MINOR COURSE ', 'SEMESTER', 'REGISTERED STUDENTS']),
+    }
+
+
+def write_dataset(output_dir, **parameters):
+    """Generate a dataset and write its CSVs into output_dir; returns {csv filename: row count}"""
+    os.makedirs(output_dir, exist_ok=True)
+    counts = {}
+    for filename, frame in generate_dataset(**parameters).items():
+        frame.to_csv(os.path.join(output_dir, filename), index=False)
+        counts[filename] = len(frame)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic timetable input CSVs")
+    parser.add_argument('output_dir', help="Directory to write the six CSV files into")
+    parser.add_argument('--scale', type=float, default=1, help="Grow branches, faculty, rooms and students by this factor")
+    for key, value in DEFAULT_PARAMETERS.items():
+        default_help = f"(default {value} x scale)" if key in SCALED_PARAMETERS else f"(default {value})"
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, default=None, help=default_help)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    overrides = {key: getattr(args, key) for key in DEFAULT_PARAMETERS if getattr(args, key) is not None}
+    parameters = scaled_parameters(args.scale, **overrides)
+    counts = write_dataset(args.output_dir, seed=args.seed, **parameters)
+    print(f"[OK] Wrote synthetic dataset to {args.output_dir} ({parameters}, seed={args.seed})")
+    for filename, count in counts.items():
+        print(f"   {filename}: {count} rows")
+
+
+if __name__ == '__main__':
+    main()